@@ -4,8 +4,22 @@
 # --- Imports ---
 import configparser
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import yaml
-from bs4 import BeautifulSoup
+# Optional HTML parsers: only used when the href regex finds no anchors on a page
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
+try:
+    import orjson # Optional: faster links.json serialisation (output is byte-identical to the json fallback)
+except ImportError:
+    orjson = None
 from urllib.parse import urljoin, urlparse
 import fnmatch # For wildcard matching like *.iso
 import sys
@@ -13,114 +27,296 @@ import os
 import shutil # For checking command existence
 from operator import itemgetter
 import re
+import html
 import json
+import functools
 import argparse
 import subprocess
-# import hashlib # No longer needed for WindowsMode AWK approach
+import pickle
+import xml.etree.ElementTree as ET
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import hashlib # Cache file names for conditional GETs
+import tempfile
+
+# Prefer PyYAML's libyaml-backed loader; fall back to the pure-Python one if the C bindings are missing
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+MAX_WORKERS = 16 # Distros resolved concurrently; work is dominated by network round-trips
+
+# --- Precompiled Patterns ---
+_HASH_LINE_RE = re.compile(r'^([a-fA-F0-9]{32,})\s+([* ]?)(.*)') # "<hash>  [*]<filename>" (sha256sum style)
+_HASH_ALT_NAME_RE = re.compile(r'\((.*?)\)') # "SHA256 (<filename>) = <hash>" (BSD style)
+_HEX_ONLY_RE = re.compile(r'^[a-fA-F0-9]{32,}$')
+_VERSION_RE = re.compile(r'(\d+\.\d+(?:\.\d+)?(?:-\d+)?)')
+_VERSION_HEAD_RE = re.compile(r'(\d+\.\d+)') # Leading build.revision of an ESD filename
+_DIR_VERSION_RE = re.compile(r'\/(\d+\.\d+(?:\.\d+)?(?:-\d+)?)(?=\/|$)')
+_DIGIT_RE = re.compile(r'\d')
+_DIGITS_RE = re.compile(r'\d+')
+_SKIP_HREF_RE = re.compile(r'^(?:\.\./|/|\?|#|mailto:)|://') # Parent/absolute/query/fragment/mail or off-site links
+_HREF_RE = re.compile(rb'<a\s[^>]*href=["\']([^"\']+)["\']', re.I) # <a ... href="..."> in raw page bytes
+
+# --- Shared HTTP Session ---
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Referer': 'https://getfedora.org/',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5'
+} # More browser-like headers to avoid 403 errors on mirrors
+
+# One long-lived session so keep-alive connections (and TLS handshakes) are reused across distros
+_SESSION = requests.Session()
+_SESSION.headers.update(DEFAULT_HEADERS)
+
+def configure_session_pool(workers):
+    """
+    (Re)mounts the pooled adapter so each host can hold one keep-alive connection per
+    in-flight request: every worker plus its size-probe thread.
+    """
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=max(32, workers * 2),
+                          max_retries=Retry(total=5, backoff_factor=0.5, status_forcelist=[403, 404, 500, 502, 503, 504],
+                                            allowed_methods=frozenset(['GET', 'HEAD'])))
+    _SESSION.mount('http://', adapter); _SESSION.mount('https://', adapter)
+
+configure_session_pool(MAX_WORKERS)
+
+# --- Conditional GET Cache ---
+# Listing pages and remote YAML are kept on disk with their ETag/Last-Modified so re-runs can revalidate instead of re-downloading
+HTTP_CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')), 'iso-list')
+
+def _write_cache_file(path, data):
+    """Atomically replaces path with data (bytes), so concurrent workers never see a partial file."""
+    fd, tmp_path = tempfile.mkstemp(dir=HTTP_CACHE_DIR)
+    try:
+        with os.fdopen(fd, 'wb') as f: f.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path); raise
+
+def conditional_get(session, url, timeout=20, max_bytes=None, required_type=None):
+    """
+    GETs url as bytes (at most max_bytes + 1 when given, so callers can detect truncation),
+    sending If-None-Match/If-Modified-Since for a copy cached in HTTP_CACHE_DIR.
+    Returns (body, content_type); a 304 answer is served from the cached body.
+    If required_type is given and the response declares a Content-Type without it,
+    the body is never downloaded and b'' is returned.
+    """
+    cache_base = os.path.join(HTTP_CACHE_DIR, hashlib.sha1(url.encode('utf-8')).hexdigest())
+    meta = {}
+    try:
+        with open(cache_base + '.meta', 'r', encoding='utf-8') as f: meta = json.load(f)
+    except (OSError, ValueError): pass # Not cached yet (or unreadable): plain GET
+    headers = {}
+    if meta.get('etag'): headers['If-None-Match'] = meta['etag']
+    if meta.get('last_modified'): headers['If-Modified-Since'] = meta['last_modified']
+
+    with session.get(url, headers=headers, timeout=timeout, stream=True) as response: # Retries with backoff are handled by the session's adapter
+        if response.status_code == 304 and headers:
+            try:
+                with open(cache_base + '.body', 'rb') as f: return f.read(), meta.get('content_type', '')
+            except OSError: # Body vanished underneath its metadata; drop both and fetch unconditionally
+                try: os.remove(cache_base + '.meta')
+                except FileNotFoundError: pass # Another worker already dropped it
+                return conditional_get(session, url, timeout, max_bytes, required_type)
+        response.raise_for_status()
+        content_type = response.headers.get('Content-Type', '')
+        if required_type and content_type and required_type not in content_type.lower():
+            return b'', content_type # Headers are in, body still unread: closing here skips the download
+        body = response.raw.read(max_bytes + 1 if max_bytes is not None else None, decode_content=True)
+        new_meta = {'url': url, 'etag': response.headers.get('ETag'), 'last_modified': response.headers.get('Last-Modified'), 'content_type': content_type}
+
+    if new_meta['etag'] or new_meta['last_modified']:
+        try:
+            os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+            _write_cache_file(cache_base + '.body', body)
+            _write_cache_file(cache_base + '.meta', json.dumps(new_meta).encode('utf-8')) # Written last: meta implies a matching body
+        except OSError as e: log.warning(f"  Warning: Could not cache response for {url}: {e}")
+    return body, content_type
+
+# --- Logging ---
+log = logging.getLogger(__name__)
+
+class _ThreadBufferedHandler(logging.StreamHandler):
+    """Stream handler that diverts records into a per-thread buffer while one is active."""
+    def __init__(self, stream=None):
+        super().__init__(stream)
+        self._local = threading.local()
+
+    def emit(self, record):
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None: return super().emit(record)
+        try: buffer.append(self.format(record) + self.terminator)
+        except Exception: self.handleError(record)
+
+_LOG_HANDLER = _ThreadBufferedHandler(sys.stdout)
+_LOG_HANDLER.setFormatter(logging.Formatter('%(message)s')) # Plain lines, as the output has always looked
+
+def _run_buffered(func, *args):
+    """
+    Runs func(*args) with its log output collected, then emits it in one write
+    so progress messages from concurrently processed distros do not interleave.
+    """
+    _LOG_HANDLER._local.buffer = []
+    try:
+        return func(*args)
+    finally:
+        output = ''.join(_LOG_HANDLER._local.buffer); _LOG_HANDLER._local.buffer = None
+        if output:
+            with _LOG_HANDLER.lock: _LOG_HANDLER.stream.write(output); _LOG_HANDLER.stream.flush()
 
 # --- Configuration Loading ---
 def load_config(config_file='iso-list.conf'):
     """Loads configuration from the .conf file."""
     config = configparser.ConfigParser()
     config_data = {'settings': {}, 'scripts': {}}
-    if not os.path.exists(config_file):
-        print(f"Warning: Config file '{config_file}' not found. Using defaults.")
-        return config_data
-
     try:
-        config.read(config_file)
+        with open(config_file, 'r', encoding='utf-8') as f: config.read_file(f)
         if 'Settings' in config and 'yaml_source' in config['Settings']:
             config_data['settings']['yaml_source'] = config['Settings']['yaml_source']
         else:
-             print(f"Warning: Missing [Settings] or 'yaml_source' in '{config_file}'.")
+             log.warning(f"Warning: Missing [Settings] or 'yaml_source' in '{config_file}'.")
 
         # Only need the download script path now for WindowsMode Ensure XML step
         if 'ExternalScripts' in config:
             config_data['scripts']['download'] = config['ExternalScripts'].get('download_script_path')
 
+        return config_data
+    except FileNotFoundError:
+        log.warning(f"Warning: Config file '{config_file}' not found. Using defaults.")
         return config_data
     except configparser.Error as e:
-        print(f"Error parsing config file '{config_file}': {e}. Using defaults.")
+        log.error(f"Error parsing config file '{config_file}': {e}. Using defaults.")
         return config_data # Return empty on parse error
 
 # --- YAML Data Loading ---
+YAML_CACHE_VERSION = 1 # Bump to invalidate existing .pkl sidecars when the cached structure changes
+
+def _load_yaml_cache(source, cache_path):
+    """Returns cached distributions if the sidecar matches the source's mtime/size, else None."""
+    try:
+        stat = os.stat(source)
+        with open(cache_path, 'rb') as f:
+            cache_version, mtime, size, distributions = pickle.load(f)
+    except Exception:
+        return None # Missing, unreadable or stale-format cache; fall back to parsing
+    if (cache_version, mtime, size) != (YAML_CACHE_VERSION, stat.st_mtime, stat.st_size):
+        return None
+    return distributions
+
+def _save_yaml_cache(source, cache_path, distributions):
+    """Writes the parsed distributions to a pickle sidecar keyed by the source's mtime/size."""
+    try:
+        stat = os.stat(source)
+        with open(cache_path, 'wb') as f:
+            pickle.dump((YAML_CACHE_VERSION, stat.st_mtime, stat.st_size, distributions), f, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        log.warning(f"Warning: Could not write YAML cache '{cache_path}': {e}")
+
 def load_yaml_data(source):
     """Loads YAML data from a URL or local file."""
     source = source or 'distros.yaml' # Default to local file if not specified
+    cache_path = None
     try:
         if source.startswith(('http://', 'https://')):
-            print(f"Fetching YAML data from URL: {source}")
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5'
-            }
-            response = requests.get(source, timeout=15, headers=headers)
-            response.raise_for_status()
-            yaml_content = response.text
+            log.info(f"Fetching YAML data from URL: {source}")
+            yaml_body, _ = conditional_get(_SESSION, source, timeout=15) # Pooled connection and retries shared with the distro lookups
+            yaml_content = yaml_body.decode('utf-8')
         else:
-            print(f"Reading YAML data from local file: {source}")
-            if not os.path.exists(source):
-                print(f"Error: YAML file '{source}' not found.")
+            log.info(f"Reading YAML data from local file: {source}")
+            cache_path = source + '.pkl'
+            cached = _load_yaml_cache(source, cache_path) # A missing source simply misses the cache
+            if cached is not None:
+                log.info(f"  Using cached parse: {cache_path}")
+                return cached
+            try:
+                with open(source, 'r', encoding='utf-8') as f:
+                    yaml_content = f.read()
+            except FileNotFoundError:
+                log.error(f"Error: YAML file '{source}' not found.")
                 sys.exit(1)
-            with open(source, 'r', encoding='utf-8') as f:
-                yaml_content = f.read()
-        data = yaml.safe_load(yaml_content)
+        data = yaml.load(yaml_content, Loader=_YamlLoader)
         if not data or 'distributions' not in data:
-             print(f"Error: YAML data empty or missing 'distributions'.")
+             log.error(f"Error: YAML data empty or missing 'distributions'.")
              sys.exit(1)
         if not isinstance(data['distributions'], list):
-             print(f"Error: YAML 'distributions' must be a list.")
+             log.error(f"Error: YAML 'distributions' must be a list.")
              sys.exit(1)
+        if cache_path: _save_yaml_cache(source, cache_path, data['distributions'])
         return data['distributions']
     except Exception as e:
-        print(f"Error loading/parsing YAML from '{source}': {e}")
+        log.error(f"Error loading/parsing YAML from '{source}': {e}")
         sys.exit(1)
 
 
 # --- Helper function for sorting version strings ---
+_VERSION_KEY_WIDTH = 8 # Assumes at most 8 numeric runs per name; arch tags like x86_64 use up two of them
+_NO_VERSION_KEY = (-1,) + (0,) * (_VERSION_KEY_WIDTH - 1) # Names without digits sort below any version
+
+@functools.lru_cache(maxsize=4096) # Bounded: plenty for every name seen in one run, without growing unchecked
+def _version_key(name):
+    """Parses the numeric components of a (stripped) name into a fixed-length, zero-padded tuple."""
+    parts = _DIGITS_RE.findall(name)[:_VERSION_KEY_WIDTH]
+    if not parts: return _NO_VERSION_KEY
+    return tuple(map(int, parts)) + (0,) * (_VERSION_KEY_WIDTH - len(parts))
+
 def sort_key_version(item_dict):
     """Creates a sort key for version strings."""
-    version_str = item_dict.get('name', '').strip('/')
-    parts = re.findall(r'\d+', version_str)
-    try:
-        return tuple(map(int, parts)) if parts else (-1,)
-    except ValueError:
-        return (-1,) * len(parts) if parts else (-1,)
+    return _version_key(item_dict.get('name', '').strip('/'))
 
-# --- Helper function to check multiple VersionMatch criteria ---
-def check_version_match(item_name, version_match_criteria):
-    """Checks if item name contains all specified version match criteria."""
+# --- Helper functions to check multiple VersionMatch criteria ---
+def normalize_version_match(version_match_criteria):
+    """
+    Converts the YAML VersionMatch value into a tuple of required substrings.
+    An empty tuple means no filter. Called once per distro so the per-link check stays cheap.
+    """
     # Treat None or "" as no filter
     if version_match_criteria is None or version_match_criteria == "":
-        return True
+        return ()
     if isinstance(version_match_criteria, str):
-        return version_match_criteria in item_name
+        return (version_match_criteria,)
     elif isinstance(version_match_criteria, list):
-        if not version_match_criteria: return True # Empty list matches all
-        try:
-            return all(str(criterion) in item_name for criterion in version_match_criteria)
-        except TypeError:
-             print(f"  Warning: Non-string item in VersionMatch list: {version_match_criteria}. Check YAML.")
-             return False
+        return tuple(str(criterion) for criterion in version_match_criteria) # Empty list matches all
     else:
         # Handle unexpected type for VersionMatch
-        print(f"  Warning: Unexpected type for VersionMatch: {type(version_match_criteria)}. Ignoring filter.")
-        return True # Default to passing if type is wrong
+        log.warning(f"  Warning: Unexpected type for VersionMatch: {type(version_match_criteria)}. Ignoring filter.")
+        return () # Default to passing if type is wrong
+
+def check_version_match(item_name, version_terms):
+    """Checks if item name contains all terms from normalize_version_match()."""
+    for term in version_terms:
+        if term not in item_name: return False
+    return True
+
+# --- Helper function to compile Extension/HashMatch globs ---
+@functools.lru_cache(maxsize=256)
+def glob_matcher(pattern):
+    """Returns a match function for a shell-style glob, translated and compiled once per distinct pattern."""
+    return re.compile(fnmatch.translate(pattern)).match
 
 # --- Helper function to infer hash type ---
+@functools.lru_cache(maxsize=256)
+def _infer_hash_type_from_name(pattern_or_filename):
+    """Returns the algorithm named in a hash file pattern/filename, or None."""
+    name_lower = pattern_or_filename.lower()
+    # Check for explicit algorithm names
+    if 'sha512' in name_lower: return 'SHA512'
+    if 'sha256' in name_lower: return 'SHA256'
+    if 'sha1' in name_lower: return 'SHA1'
+    if 'md5' in name_lower: return 'MD5'
+    return None
+
 def infer_hash_type(pattern_or_filename, found_hash_value=None):
     """
     Infers hash type from pattern/filename first, then hash length.
     Returns common algorithm names (e.g., 'SHA256', 'MD5') or None.
     """
     if pattern_or_filename:
-        name_lower = pattern_or_filename.lower()
-        # Check for explicit algorithm names
-        if 'sha512' in name_lower: return 'SHA512'
-        if 'sha256' in name_lower: return 'SHA256'
-        if 'sha1' in name_lower: return 'SHA1'
-        if 'md5' in name_lower: return 'MD5'
+        hash_type = _infer_hash_type_from_name(pattern_or_filename)
+        if hash_type: return hash_type
 
     # Fallback: Check length of the found hash value
     if found_hash_value:
@@ -132,47 +328,130 @@ def infer_hash_type(pattern_or_filename, found_hash_value=None):
         if hash_len == 40: return 'SHA1'
         if hash_len == 32: return 'MD5'
 
-    print(f"    Could not infer hash type from pattern '{pattern_or_filename}' or hash length.")
+    log.debug(f"    Could not infer hash type from pattern '{pattern_or_filename}' or hash length.")
     return None # Cannot determine
 
 # --- Helper function to parse hash file content ---
-def parse_hash_file(hash_content, target_iso_filename):
+def parse_hash_file(hash_lines, target_iso_filename):
     """
     Parses standard checksum file formats (like sha256sum output)
     to find the hash for a specific target filename.
+    Accepts any iterable of text lines (e.g. a streamed response's iter_lines())
+    and stops consuming it at the first match.
     """
-    print(f"    Parsing hash file content for '{target_iso_filename}'...")
+    log.debug(f"    Parsing hash file content for '{target_iso_filename}'...")
     hash_value = None
-    line_regex = re.compile(r'^([a-fA-F0-9]{32,})\s+([* ]?)(.*)')
 
-    lines = hash_content.splitlines()
-    for line_num, line in enumerate(lines):
+    for line_num, line in enumerate(hash_lines):
+        if target_iso_filename not in line: continue # Both formats name the file verbatim; skip regex work on other lines
         line = line.strip()
         if not line or line.startswith('#'): continue
 
-        match = line_regex.match(line)
+        match = _HASH_LINE_RE.match(line)
         if match:
             potential_hash, separator, filename_part = match.groups()
             if filename_part == target_iso_filename or filename_part.endswith('/' + target_iso_filename):
-                 print(f"      Found hash for '{target_iso_filename}' on line {line_num+1}: {potential_hash}")
+                 log.debug(f"      Found hash for '{target_iso_filename}' on line {line_num+1}: {potential_hash}")
                  hash_value = potential_hash; break
 
         elif '=' in line and '(' in line and ')' in line:
              parts = line.split('=', 1)
              if len(parts) == 2:
                  left_part, potential_hash = parts[0].strip(), parts[1].strip()
-                 name_match = re.search(r'\((.*?)\)', left_part)
+                 name_match = _HASH_ALT_NAME_RE.search(left_part)
                  if name_match:
                       filename_in_parens = name_match.group(1)
-                      if filename_in_parens == target_iso_filename and re.match(r'^[a-fA-F0-9]{32,}$', potential_hash):
-                           print(f"      Found hash (alt format) for '{target_iso_filename}' on line {line_num+1}: {potential_hash}")
+                      if filename_in_parens == target_iso_filename and _HEX_ONLY_RE.match(potential_hash):
+                           log.debug(f"      Found hash (alt format) for '{target_iso_filename}' on line {line_num+1}: {potential_hash}")
                            hash_value = potential_hash; break
 
     if not hash_value:
-        print(f"    Hash for '{target_iso_filename}' not found within the hash file content.")
+        log.debug(f"    Hash for '{target_iso_filename}' not found within the hash file content.")
 
     return hash_value
 
+# --- Helper function to extract links from a directory listing ---
+def extract_hrefs(html_content):
+    """
+    Returns the unique hrefs of the <a> tags in an HTML page (raw bytes), in page order.
+    Index pages only need their anchors, so a bytes regex scan is used; a real
+    HTML parser (lxml or BeautifulSoup, whichever is installed) is the fallback when it finds nothing.
+    Duplicates (e.g. icon and name columns linking the same file) are dropped up front.
+    """
+    raw_hrefs = _HREF_RE.findall(html_content)
+    if raw_hrefs:
+        hrefs = [html.unescape(href.decode('utf-8', 'replace')) for href in dict.fromkeys(raw_hrefs)]
+    elif not html_content.strip(): return []
+    elif lxml is not None:
+        hrefs = [str(href) for href in lxml.html.fromstring(html_content).xpath('//a/@href')]
+    elif BeautifulSoup is not None:
+        soup = BeautifulSoup(html_content, 'html.parser')
+        hrefs = [link['href'] for link in soup.find_all('a', href=True)]
+    else: return []
+    return list(dict.fromkeys(hrefs))
+
+# --- Helper function to download a directory listing ---
+MAX_LISTING_BYTES = 16 * 1024 * 1024 # Generous cap; real mirror indexes are a few MB at most
+
+def fetch_listing(session, url):
+    """
+    Returns the body of a directory listing page as bytes, streamed straight from
+    the socket (or revalidated from the on-disk cache) and capped at MAX_LISTING_BYTES.
+    Non-HTML responses are rejected from their headers and yield b''.
+    """
+    content, content_type = conditional_get(session, url, timeout=20, max_bytes=MAX_LISTING_BYTES, required_type='html')
+    if not content_type: log.warning(f"  Warn: No Content-Type at {url}; scanning anyway")
+    elif 'html' not in content_type.lower(): log.warning(f"  Warn: Skipped non-HTML listing at {url} ({content_type})")
+    if len(content) > MAX_LISTING_BYTES:
+        log.warning(f"  Warn: Listing at {url} exceeds {MAX_LISTING_BYTES} bytes; only the first part is scanned")
+        content = content[:MAX_LISTING_BYTES]
+    return content
+
+# --- Helper function to classify listing links in one pass ---
+def classify_listing(hrefs, page_url, extension_match, version_terms, hash_file_match=None):
+    """
+    Sorts a listing's hrefs, in a single pass, into matching files, candidate
+    version directories and hash files. Returns (files, dirs, hash_files) as lists of
+    dicts with 'name' and 'url' keys (files and hash files also carry 'filename').
+    """
+    files = []; dirs = []; hash_files = []
+    for href in hrefs:
+        if not href: continue
+        if href.endswith('/'):
+            if href != '../' and not href.startswith(('?', '#')):
+                dir_name = href.strip('/')
+                if check_version_match(dir_name, version_terms):
+                    # Without VersionMatch, only keep dirs that look like versions (or are short)
+                    if version_terms or _DIGIT_RE.search(dir_name) or len(dir_name) < 15:
+                        dirs.append({'name': dir_name, 'url': urljoin(page_url, href)})
+            continue
+        filename = href.rpartition('/')[2]
+        off_page = _SKIP_HREF_RE.search(href) and not href.startswith(page_url)
+        if not off_page and extension_match(filename) and check_version_match(filename, version_terms):
+            files.append({'filename': filename, 'url': urljoin(page_url, href), 'name': filename})
+        elif hash_file_match and hash_file_match(filename) and not href.startswith(('?', '#', 'mailto:', '../')) \
+                and ('://' not in href or href.startswith(page_url)):
+            hash_files.append({'filename': filename, 'url': urljoin(page_url, href), 'name': filename})
+    return files, dirs, hash_files
+
+# --- Helper function to probe remote file size ---
+def fetch_file_size(session, file_url):
+    """
+    Returns the size of file_url in bytes, or None if the server doesn't report it.
+    Uses HEAD's Content-Length, falling back to a one-byte Range GET whose
+    Content-Range carries the total size. Does not print, so it can run on a helper thread.
+    """
+    head_response = session.head(file_url, timeout=15, allow_redirects=True)
+    head_response.raise_for_status()
+    content_length = head_response.headers.get('Content-Length')
+    if content_length: return int(content_length)
+    # Servers omitting Content-Length on HEAD usually stream GETs chunked too, so ask for "bytes 0-0/<total>" instead
+    with session.get(file_url, headers={'Range': 'bytes=0-0'}, stream=True, timeout=15, allow_redirects=True) as range_response: # Body never read if Range is ignored
+        range_response.raise_for_status()
+        total_size = range_response.headers.get('Content-Range', '').rpartition('/')[2]
+        if range_response.status_code == 206 and total_size.isdigit(): return int(total_size)
+    return None
+
 # --- Core ISO/ESD Finding Logic (Web Scraping - find_iso_web) ---
 def find_iso_web(distro_info):
     """
@@ -190,40 +469,32 @@ def find_iso_web(distro_info):
     # --- Handle DIRECT directive ---
     direct_url = distro_info.get('DIRECT')
     if direct_url and isinstance(direct_url, str):
-        print(f"\nProcessing (DIRECT Mode): {name}")
+        log.info(f"\nProcessing (DIRECT Mode): {name}")
         
         # Get version from YAML or default to Unknown
         version = distro_info.get('Version', "Unknown")
-        print(f"  Using version from YAML: {version}")
+        log.info(f"  Using version from YAML: {version}")
         
         # Get SHA256 from YAML
         direct_hash = distro_info.get('SHA256')
         if not direct_hash:
-            print(f"  Warning: No SHA256 provided for DIRECT download")
+            log.warning(f"  Warning: No SHA256 provided for DIRECT download")
             
-        print(f"  Using direct URL: {direct_url}")
+        log.info(f"  Using direct URL: {direct_url}")
         if direct_hash:
-            print(f"  Using provided SHA256: {direct_hash}")
+            log.info(f"  Using provided SHA256: {direct_hash}")
             
-        # Try to get file size
-        file_size = None
-        try:
-            session = requests.Session()
-            session.headers.update({
-                'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Referer': 'https://getfedora.org/',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5'
-            })
-            
-            head_response = session.head(direct_url, timeout=15, allow_redirects=True)
-            head_response.raise_for_status()
-            content_length = head_response.headers.get('Content-Length')
-            if content_length:
-                file_size = int(content_length)
-                print(f"  Size: {file_size} bytes")
-        except Exception as e:
-            print(f"  Error getting file size: {e}")
+        # Use Size from YAML if given (no network access at all), else try to get it from the server
+        file_size = distro_info.get('Size')
+        if isinstance(file_size, int) and not isinstance(file_size, bool):
+            log.info(f"  Using size from YAML: {file_size} bytes")
+        else:
+            file_size = None
+            try:
+                file_size = fetch_file_size(_SESSION, direct_url)
+                if file_size: log.info(f"  Size: {file_size} bytes")
+            except Exception as e:
+                log.error(f"  Error getting file size: {e}")
         
         # Make sure version is the correct one from YAML    
         result = {
@@ -235,343 +506,257 @@ def find_iso_web(distro_info):
         if file_size:
             result['size'] = file_size
             
-        print(f"  Final result data: {result}")
+        log.debug(f"  Final result data: {result}")
         return result
 
     # --- Regular processing for non-DIRECT entries ---
     # --- Validation ---
     if not base_url or not isinstance(base_url, str) or not base_url.strip():
-        print(f"\nSkipping: Invalid/missing 'URL' for '{name}'.")
+        log.warning(f"\nSkipping: Invalid/missing 'URL' for '{name}'.")
         return None
     if not extension_pattern or not isinstance(extension_pattern, str):
-        print(f"\nSkipping: Invalid or missing 'Extension' for '{name}'. Must be string pattern.")
+        log.warning(f"\nSkipping: Invalid or missing 'Extension' for '{name}'. Must be string pattern.")
         return None
     if version_match_input is not None and version_match_input != "" and not isinstance(version_match_input, (str, list)):
-        print(f"\nWarning: Invalid type for 'VersionMatch' in '{name}'. Ignoring filter.")
+        log.warning(f"\nWarning: Invalid type for 'VersionMatch' in '{name}'. Ignoring filter.")
         version_match_input = None
     if hash_match_pattern is not None and not isinstance(hash_match_pattern, str):
-         print(f"\nWarning: Invalid type for 'HashMatch' in '{name}'. Ignoring hash search.")
+         log.warning(f"\nWarning: Invalid type for 'HashMatch' in '{name}'. Ignoring hash search.")
          hash_match_pattern = None
     if not isinstance(path_navigation, list):
-         print(f"\nWarning: Invalid type for 'PathNavigation' in '{name}'. Must be a list of directory names.")
+         log.warning(f"\nWarning: Invalid type for 'PathNavigation' in '{name}'. Must be a list of directory names.")
          path_navigation = []
 
-    print(f"\nProcessing (Web): {name}")
-    print(f"  Base URL: {base_url}")
-    print(f"  Looking for pattern: {extension_pattern}")
-    print(f"  VersionMatch criteria: {version_match_input}")
-    if hash_match_pattern: print(f"  Looking for Hash pattern: {hash_match_pattern}")
-    if path_navigation: print(f"  Path navigation sequence: {path_navigation}")
-
-    session = requests.Session()
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Referer': 'https://getfedora.org/',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5'
-    }) # More browser-like headers to avoid 403 errors on mirrors
+    version_terms = normalize_version_match(version_match_input)
+    # Compiled glob matchers; the link loops then only run regex matches
+    extension_match = glob_matcher(extension_pattern)
+    hash_file_match = glob_matcher(hash_match_pattern) if hash_match_pattern else None
+
+    log.info(f"\nProcessing (Web): {name}")
+    log.debug(f"  Base URL: {base_url}")
+    log.debug(f"  Looking for pattern: {extension_pattern}")
+    log.debug(f"  VersionMatch criteria: {version_match_input}")
+    if hash_match_pattern: log.debug(f"  Looking for Hash pattern: {hash_match_pattern}")
+    if path_navigation: log.debug(f"  Path navigation sequence: {path_navigation}")
+
+    session = _SESSION
 
     selected_file_url = None; selected_filename = None
-    file_directory_url = None; directory_links = []
+    file_directory_url = None; directory_hash_files = []
+
+    listing_cache = {} # url -> hrefs, so each listing page is fetched and parsed at most once per distro
+    def get_listing(url):
+        if url not in listing_cache:
+            listing_cache[url] = extract_hrefs(fetch_listing(session, url))
+        else: log.debug(f"    Reusing already fetched listing: {url}")
+        return listing_cache[url]
 
     try:
         # --- Attempt 1: Look for file directly in the base URL ---
-        print(f"  Attempt 1: Checking base URL: {base_url}")
-        retry_count = 0
-        max_retries = 5
-        original_url = base_url
-        
-        while retry_count < max_retries:
-            try:
-                response = session.get(base_url, timeout=20)
-                
-                # Check for error responses that might indicate mirror issues
-                if response.status_code in (403, 404, 500):
-                    print(f"    Received {response.status_code} error from {base_url}")
-                    retry_count += 1
-                    if retry_count >= max_retries:
-                        print(f"    Exceeded max retries ({max_retries}). Giving up.")
-                        return None
-                        
-                    print(f"    Retry {retry_count}/{max_retries}: Starting over with original URL")
-                    # Reset to original URL
-                    base_url = original_url
-                    continue
-                    
-                response.raise_for_status()
-                break  # Success, exit retry loop
-                
-            except requests.exceptions.RequestException as e:
-                print(f"    Error during request: {e}")
-                retry_count += 1
-                if retry_count >= max_retries:
-                    print(f"    Exceeded max retries ({max_retries}). Giving up.")
-                    return None
-                    
-                print(f"    Retry {retry_count}/{max_retries}: Starting over with original URL")
-                base_url = original_url
-                continue
-                
-        # Get content type and prepare soup outside the retry loop
-        content_type = response.headers.get('Content-Type', '').lower()
-        if 'html' not in content_type: print(f"  Warn: Non-HTML at {base_url}")
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-        links = soup.find_all('a', href=True)
-        directory_links = links
+        log.info(f"  Attempt 1: Checking base URL: {base_url}")
+        potential_files, potential_dirs, directory_hash_files = classify_listing(
+            get_listing(base_url), base_url, extension_match, version_terms, hash_file_match)
         file_directory_url = base_url
 
-        potential_files = []
-        for link in links:
-            href = link['href']
-            if not href or href.startswith(('../', '/', '?', '#', 'mailto:')) or '://' in href:
-                 if not href.startswith(base_url): continue
-            filename = href.split('/')[-1]
-            if fnmatch.fnmatch(filename, extension_pattern) and \
-               check_version_match(filename, version_match_input):
-                full_url = urljoin(base_url, href)
-                potential_files.append({'filename': filename, 'url': full_url, 'name': filename})
-
         if potential_files:
-            potential_files.sort(key=sort_key_version, reverse=True)
-            selected_file = potential_files[0]
-            print(f"  Found matching file directly: {selected_file['filename']}")
+            selected_file = max(potential_files, key=sort_key_version) # Single pass; first of equal keys wins, as with a stable sort
+            log.info(f"  Found matching file directly: {selected_file['filename']}")
             if selected_file['url'].startswith(('http://', 'https://')):
                 selected_file_url = selected_file['url']; selected_filename = selected_file['filename']
-            else: print(f"  Error: Constructed URL '{selected_file['url']}' is not absolute."); return None
+            else: log.error(f"  Error: Constructed URL '{selected_file['url']}' is not absolute."); return None
             # If we found the file directly, skip path navigation
             path_navigation = []
 
         # --- Attempt 2 & 3: Only if file not found directly ---
         if selected_file_url is None:
-            print(f"  Attempt 2: Looking for version directories...")
-            potential_dirs = []
-            for link in links:
-                href = link['href']
-                if href.endswith('/') and href != '../' and not href.startswith(('?', '#')):
-                    dir_name = href.strip('/')
-                    if check_version_match(dir_name, version_match_input):
-                        # Use effective version match to decide if sanity check needed
-                        effective_vm = version_match_input if version_match_input else None
-                        if effective_vm is not None or re.search(r'\d', dir_name) or len(dir_name) < 15 :
-                             potential_dirs.append({'name': dir_name, 'url': urljoin(base_url, href)})
-
-            if not potential_dirs: print("  No suitable version directories found."); return None
-            potential_dirs.sort(key=sort_key_version, reverse=True)
-            print(f"  Found {len(potential_dirs)} potential dirs matching criteria.")
+            log.info(f"  Attempt 2: Looking for version directories...")
+            if not potential_dirs: log.warning("  No suitable version directories found."); return None
+            log.info(f"  Found {len(potential_dirs)} potential dirs matching criteria.")
 
             target_dir_info = None
             effective_vm = version_match_input if version_match_input else None
             if effective_vm is None:
-                print(f"  Selecting best directory (No VersionMatch, avoiding aliases)...")
+                log.info(f"  Selecting best directory (No VersionMatch, avoiding aliases)...")
                 avoid = ["latest", "current", "stable"]
+                non_alias_dirs = []
                 for pd in potential_dirs:
-                    last = pd.get('name', '').rsplit('/', 1)[-1] or pd.get('name', '')
-                    if last.lower() in avoid: print(f"    Skip '{pd['name']}' (alias '{last}')."); continue
-                    print(f"    Select candidate (non-alias): '{pd['name']}'"); target_dir_info = pd; break
-                if target_dir_info is None and potential_dirs: print("  WARN: Only alias dirs found. Fallback."); target_dir_info = potential_dirs[0]
+                    last = pd.get('name', '').rpartition('/')[2] or pd.get('name', '')
+                    if last.lower() in avoid: log.debug(f"    Skip '{pd['name']}' (alias '{last}')."); continue
+                    non_alias_dirs.append(pd)
+                if non_alias_dirs: target_dir_info = max(non_alias_dirs, key=sort_key_version); log.debug(f"    Select candidate (non-alias): '{target_dir_info['name']}'")
+                elif potential_dirs: log.warning("  WARN: Only alias dirs found. Fallback."); target_dir_info = max(potential_dirs, key=sort_key_version)
             else:
-                print(f"  Selecting highest version dir strictly matching VersionMatch...")
-                if potential_dirs: target_dir_info = potential_dirs[0]; print(f"    Select candidate (strict match): '{target_dir_info['name']}'")
-            if target_dir_info is None: print("  Failed to select target directory."); return None
+                log.info(f"  Selecting highest version dir strictly matching VersionMatch...")
+                if potential_dirs: target_dir_info = max(potential_dirs, key=sort_key_version); log.debug(f"    Select candidate (strict match): '{target_dir_info['name']}'")
+            if target_dir_info is None: log.warning("  Failed to select target directory."); return None
 
             target_dir_url = target_dir_info['url']
-            print(f"  Selected target directory: {target_dir_info['name']}/ -> {target_dir_url}")
+            log.info(f"  Selected target directory: {target_dir_info['name']}/ -> {target_dir_url}")
 
             # --- Handle PathNavigation if specified ---
             if path_navigation:
-                print(f"  Following path navigation sequence: {path_navigation}")
+                log.info(f"  Following path navigation sequence: {path_navigation}")
                 current_url = target_dir_url
-                original_url = target_dir_url  # Save original URL for retries
-                retry_count = 0
-                max_retries = 5
-                
-                # Keep track of where we are in the path navigation
-                navigation_index = 0
-                while navigation_index < len(path_navigation) and retry_count < max_retries:
-                    dir_name = path_navigation[navigation_index]
-                    print(f"    Navigating to: {dir_name}")
+                for dir_name in path_navigation:
+                    log.debug(f"    Navigating to: {dir_name}")
                     try:
-                        resp = session.get(current_url, timeout=20)
-                        
-                        # Check for error responses that might indicate mirror issues
-                        if resp.status_code in (403, 404, 500):
-                            print(f"    Received {resp.status_code} error from {current_url}")
-                            retry_count += 1
-                            if retry_count >= max_retries:
-                                print(f"    Exceeded max retries ({max_retries}). Giving up.")
-                                return None
-                                
-                            print(f"    Retry {retry_count}/{max_retries}: Starting over with original URL")
-                            # Reset to original URL and start path navigation over
-                            current_url = original_url
-                            navigation_index = 0
-                            continue
-                            
-                        resp.raise_for_status()
-                        
-                        soup = BeautifulSoup(resp.text, 'html.parser')
-                        links = soup.find_all('a', href=True)
-                        
-                        # Find the matching directory
-                        found = False
-                        for link in links:
-                            href = link['href']
-                            if href.endswith('/') and href.strip('/') == dir_name:
-                                current_url = urljoin(current_url, href)
-                                found = True
-                                break
-                        
-                        if not found:
-                            print(f"    Error: Directory '{dir_name}' not found in {current_url}")
-                            return None
-                            
-                        # Successfully navigated to this directory, move to next
-                        navigation_index += 1
-                            
+                        nav_hrefs = get_listing(current_url)
                     except requests.exceptions.RequestException as e:
-                        print(f"    Error navigating to {dir_name}: {e}")
+                        log.error(f"    Error navigating to {dir_name}: {e}")
+                        return None
+
+                    # Find the matching directory
+                    for href in nav_hrefs:
+                        if href.endswith('/') and href.strip('/') == dir_name:
+                            current_url = urljoin(current_url, href)
+                            break
+                    else:
+                        log.error(f"    Error: Directory '{dir_name}' not found in {current_url}")
                         return None
-                
-                if retry_count >= max_retries:
-                    print(f"  Failed to navigate path after {max_retries} retries")
-                    return None
-                    
+
                 target_dir_url = current_url
-                print(f"  Final navigation URL: {target_dir_url}")
+                log.info(f"  Final navigation URL: {target_dir_url}")
 
-            print(f"  Attempt 3: Checking inside: {target_dir_url}")
-            try: resp_subdir = session.get(target_dir_url, timeout=20); resp_subdir.raise_for_status()
-            except requests.exceptions.RequestException as e_sub: print(f"  ERR fetch dir '{target_dir_url}': {e_sub}"); return None
+            log.info(f"  Attempt 3: Checking inside: {target_dir_url}")
+            try: hrefs_subdir = get_listing(target_dir_url)
+            except requests.exceptions.RequestException as e_sub: log.error(f"  ERR fetch dir '{target_dir_url}': {e_sub}"); return None
             file_directory_url = target_dir_url
-            soup_subdir = BeautifulSoup(resp_subdir.text, 'html.parser'); links_subdir = soup_subdir.find_all('a', href=True)
-            directory_links = links_subdir
-
-            matching_files_subdir = []
-            for link in links_subdir:
-                href = link['href']
-                if not href or href.startswith(('../', '/', '?', '#', 'mailto:')) or '://' in href:
-                     if not href.startswith(target_dir_url): continue
-                filename = href.split('/')[-1]
-                if fnmatch.fnmatch(filename, extension_pattern) and check_version_match(filename, version_match_input):
-                     full_url = urljoin(target_dir_url, href); matching_files_subdir.append({'filename': filename, 'url': full_url, 'name': filename})
-            if not matching_files_subdir: print(f"  No files matching criteria found in dir '{target_dir_info['name']}'."); return None
-            matching_files_subdir.sort(key=sort_key_version, reverse=True)
-            selected_file_subdir = matching_files_subdir[0]; print(f"  Selected final file: {selected_file_subdir['filename']}")
+            matching_files_subdir, _, directory_hash_files = classify_listing(
+                hrefs_subdir, target_dir_url, extension_match, version_terms, hash_file_match)
+            if not matching_files_subdir: log.warning(f"  No files matching criteria found in dir '{target_dir_info['name']}'."); return None
+            selected_file_subdir = max(matching_files_subdir, key=sort_key_version); log.info(f"  Selected final file: {selected_file_subdir['filename']}")
             if selected_file_subdir['url'].startswith(('http://', 'https://')):
                  selected_file_url = selected_file_subdir['url']; selected_filename = selected_file_subdir['filename']
-            else: print(f"  ERR: Bad URL '{selected_file_subdir['url']}'"); return None
+            else: log.error(f"  ERR: Bad URL '{selected_file_subdir['url']}'"); return None
 
         # --- Hash File Search (Common path) ---
         if selected_file_url:
-             print(f"  Selected file: {selected_file_url}")
+             log.info(f"  Selected file: {selected_file_url}")
              
              # --- Extract Version from filename ---
              # Check for explicit version in YAML first
              version = distro_info.get('Version')
              if version:
-                 print(f"  Using explicit version from YAML: {version}")
+                 log.info(f"  Using explicit version from YAML: {version}")
              else:
                  # Try to extract version from URL or filename if not in YAML
                  version = "Unknown (est)" # Default
                  # Try to extract version from URL
-                 match = re.search(r'(\d+\.\d+(?:\.\d+)?(?:-\d+)?)', selected_filename)
+                 match = _VERSION_RE.search(selected_filename)
+                 # If that failed, try to get it from directory path
+                 match_dir = None if match else _DIR_VERSION_RE.search(urlparse(selected_file_url).path)
                  if match:
                      version = match.group(1) # <-- Simpler extraction
-                     print(f"  Extracted version from filename: {version}")
-                 # If that failed, try to get it from directory path
-                 elif any(re.search(r'\/(\d+\.\d+(?:\.\d+)?(?:-\d+)?)(?=\/|$)', part) for part in dir_path_parts):
-                     match_dir = re.search(r'\/(\d+\.\d+(?:\.\d+)?(?:-\d+)?)(?=\/|$)', '/'.join(dir_path_parts))
-                     if match_dir:
-                         version = match_dir.group(1) + " (from dir)" # <-- Simpler extraction
-                         print(f"  Extracted version from directory: {version}")
+                     log.info(f"  Extracted version from filename: {version}")
+                 elif match_dir:
+                     version = match_dir.group(1) + " (from dir)" # <-- Simpler extraction
+                     log.info(f"  Extracted version from directory: {version}")
                  else:
-                     print(f"  No version pattern found in URL or filename, using default.")
+                     log.info(f"  No version pattern found in URL or filename, using default.")
              
-             print(f"  Extracted Version: {version}")
+             log.info(f"  Extracted Version: {version}")
 
              result_data = {'url': selected_file_url, 'hash_type': None, 'hash_value': None, 'version': version} # Add version here
              
-             # --- Get file size using HEAD request ---
-             print(f"  Getting file size for {selected_file_url}...")
-             try:
-                 head_response = session.head(selected_file_url, timeout=15, allow_redirects=True)
-                 head_response.raise_for_status()
-                 content_length = head_response.headers.get('Content-Length')
-                 if content_length:
-                     file_size = int(content_length)
-                     result_data['size'] = file_size
-                     print(f"    Size: {file_size} bytes")
-                 else:
-                     print(f"    No Content-Length header found")
-                     # If HEAD doesn't include Content-Length, try a GET with stream=True
-                     print(f"    Attempting GET request with stream=True...")
-                     get_response = session.get(selected_file_url, stream=True, timeout=15, allow_redirects=True)
-                     get_response.raise_for_status()
-                     content_length = get_response.headers.get('Content-Length')
-                     if content_length:
-                         file_size = int(content_length)
+             def record_file_size(get_size):
+                 try:
+                     file_size = get_size()
+                     if file_size is not None:
                          result_data['size'] = file_size
-                         print(f"    Size (from GET): {file_size} bytes")
-                     else:
-                         print(f"    Still no Content-Length header found")
-             except Exception as e:
-                 print(f"    Error getting file size: {e}")
-             
-             # --- Direct hash value from YAML ---
+                         log.info(f"    Size: {file_size} bytes")
+                     else: log.info(f"    No Content-Length header found")
+                 except Exception as e:
+                     log.error(f"    Error getting file size: {e}")
+
+             log.info(f"  Getting file size for {selected_file_url}...")
+
+             # --- Direct hash value from YAML: no hash file to fetch, so only the size probe remains ---
              direct_hash = distro_info.get('SHA256')
              if direct_hash:
-                 print(f"  Using direct SHA256 hash from YAML: {direct_hash}")
+                 log.info(f"  Using direct SHA256 hash from YAML: {direct_hash}")
                  result_data['hash_value'] = direct_hash
                  result_data['hash_type'] = 'SHA256'
+                 record_file_size(lambda: fetch_file_size(session, selected_file_url))
                  return result_data
-             
-             if hash_match_pattern and file_directory_url and directory_links:
-                 print(f"  Searching for hash file matching '{hash_match_pattern}' in {file_directory_url}...")
-                 found_hash_url = None; hash_file_name = None
-                 for link in directory_links:
-                     href = link['href']; hash_filename = href.split('/')[-1]
-                     if not href or href.startswith(('?', '#', 'mailto:', '../')): continue
-                     if '://' in href and not href.startswith(file_directory_url): continue
-                     if fnmatch.fnmatch(hash_filename, hash_match_pattern):
-                         found_hash_url = urljoin(file_directory_url, href); hash_file_name = hash_filename
-                         print(f"    Found hash file: {hash_filename} -> {found_hash_url}"); break
-                 if found_hash_url:
-                     try:
-                         print(f"    Fetching hash file: {found_hash_url}..."); resp_hash = session.get(found_hash_url, timeout=15); resp_hash.raise_for_status()
-                         found_hash = parse_hash_file(resp_hash.text, selected_filename) # Use found filename
-                         if found_hash:
-                             result_data['hash_value'] = found_hash
-                             result_data['hash_type'] = infer_hash_type(hash_file_name or hash_match_pattern, found_hash)
-                             print(f"      Hash: {result_data['hash_value']} ({result_data['hash_type']})")
-                         else: print(f"    Hash for '{selected_filename}' not in '{found_hash_url}'.")
-                     except requests.exceptions.RequestException as e_h: print(f"    ERR fetch hash file: {e_h}")
-                     except Exception as e_p: print(f"    ERR parse hash file: {e_p}")
-                 else: print(f"  Hash file matching '{hash_match_pattern}' not found.")
-             else: print("  Hash search skipped.")
+
+             # --- Get file size using HEAD request (overlapped with the hash file fetch below) ---
+             with ThreadPoolExecutor(max_workers=1) as probe_executor:
+                 size_future = probe_executor.submit(fetch_file_size, session, selected_file_url)
+
+                 if hash_match_pattern and file_directory_url:
+                     log.info(f"  Searching for hash file matching '{hash_match_pattern}' in {file_directory_url}...")
+                     found_hash_url = None; hash_file_name = None
+                     if directory_hash_files: # Collected while classifying the listing the file came from
+                         found_hash_url = directory_hash_files[0]['url']; hash_file_name = directory_hash_files[0]['filename']
+                         log.info(f"    Found hash file: {hash_file_name} -> {found_hash_url}")
+                     if found_hash_url:
+                         try:
+                             log.debug(f"    Fetching hash file: {found_hash_url}...")
+                             with session.get(found_hash_url, timeout=15, stream=True) as resp_hash: # Streamed: parsing stops at the matching line
+                                 resp_hash.raise_for_status()
+                                 resp_hash.encoding = resp_hash.encoding or 'utf-8' # iter_lines yields bytes without an encoding
+                                 found_hash = parse_hash_file(resp_hash.iter_lines(decode_unicode=True), selected_filename) # Use found filename
+                             if found_hash:
+                                 result_data['hash_value'] = found_hash
+                                 result_data['hash_type'] = infer_hash_type(hash_file_name or hash_match_pattern, found_hash)
+                                 log.info(f"      Hash: {result_data['hash_value']} ({result_data['hash_type']})")
+                             else: log.info(f"    Hash for '{selected_filename}' not in '{found_hash_url}'.")
+                         except requests.exceptions.RequestException as e_h: log.error(f"    ERR fetch hash file: {e_h}")
+                         except Exception as e_p: log.error(f"    ERR parse hash file: {e_p}")
+                     else: log.info(f"  Hash file matching '{hash_match_pattern}' not found.")
+                 else: log.info("  Hash search skipped.")
+
+                 record_file_size(size_future.result)
              return result_data
-        else: print("  Failed to determine file URL."); return None
-    except requests.exceptions.Timeout: print(f"  Error: Timeout occurred."); return None
-    except requests.exceptions.RequestException as e: error_details = f"URL: {e.request.url if e.request else 'N/A'}"; print(f"  Error during network request: {e} ({error_details})"); return None
-    except Exception as e: print(f"  An unexpected error occurred processing '{name}': {e}"); return None
-    finally:
-        if 'session' in locals() and session: session.close()
+        else: log.error("  Failed to determine file URL."); return None
+    except requests.exceptions.Timeout: log.error(f"  Error: Timeout occurred."); return None
+    except requests.exceptions.RequestException as e: error_details = f"URL: {e.request.url if e.request else 'N/A'}"; log.error(f"  Error during network request: {e} ({error_details})"); return None
+    except Exception as e: log.error(f"  An unexpected error occurred processing '{name}': {e}"); return None
+
 
+# --- Helper function to index the <File> records in products.xml ---
+_ESD_RECORD_FIELDS = ('FileName', 'FilePath', 'Sha1', 'Size')
+_ESD_UPDATE_LOCK = threading.Lock() # WindowsMode entries run concurrently; only one may refresh products.xml at a time
 
-# --- Function to get Windows ESD details via AWK on local XML ---
+@functools.lru_cache(maxsize=1)
+def _load_esd_index(xml_file_path, xml_mtime):
+    """
+    Streams products.xml once and returns {(language, edition, arch): record}, where each
+    record is a dict of _ESD_RECORD_FIELDS plus the 'Version' parsed from FileName (None if absent).
+    The first <File> per key wins, as with the old AWK scan.
+    xml_mtime is only part of the cache key, so a refreshed file is re-indexed.
+    """
+    index = {}
+    for _event, elem in ET.iterparse(xml_file_path, events=('end',)):
+        if elem.tag != 'File': continue
+        values = {}
+        for child in elem: values.setdefault(child.tag, child.text) # One walk over the children instead of a findtext scan per field
+        key = (values.get('LanguageCode'), values.get('Edition'), values.get('Architecture'))
+        if key not in index:
+            record = index[key] = {field: values.get(field) for field in _ESD_RECORD_FIELDS}
+            match = _VERSION_HEAD_RE.match(record['FileName'] or '') # Leading build.revision, e.g. 26100.2033 from 26100.2033.241004-2336...
+            record['Version'] = match.group(1) if match else None
+        elem.clear() # Keep memory flat while streaming
+    return index
+
+def find_esd_record(xml_file_path, language, edition, arch):
+    """Returns the products.xml record matching language/edition/arch, or None."""
+    return _load_esd_index(xml_file_path, os.path.getmtime(xml_file_path)).get((language, edition, arch))
+
+# --- Function to get Windows ESD details from local XML ---
 def get_windows_esd_details_from_xml(distro_info, config_scripts):
     """
-    Ensures products.xml is cached, then uses AWK to parse it based on
+    Ensures products.xml is cached, then parses it in-process based on
     Language, Edition, Architecture criteria from distro_info.
     Returns dict {'url': esd_url, 'hash_type': 'SHA1', 'hash_value': val} or None.
     """
     name = distro_info.get('Name', 'Windows ESD')
-    print(f"\nProcessing (WindowsMode - AWK Parse XML): {name}")
+    log.info(f"\nProcessing (WindowsMode - Parse XML): {name}")
 
     # Get Required Parameters
     edition = distro_info.get('Edition'); language = distro_info.get('Language'); arch = distro_info.get('Architecture')
-    if not all([edition, language, arch]): print(f"  Error: Missing required parameters (Edition, Language, Architecture) for '{name}'."); return None
-    print(f"  Edition: {edition}"); print(f"  Language: {language}"); print(f"  Architecture: {arch}")
+    if not all([edition, language, arch]): log.error(f"  Error: Missing required parameters (Edition, Language, Architecture) for '{name}'."); return None
+    log.debug(f"  Edition: {edition}"); log.debug(f"  Language: {language}"); log.debug(f"  Architecture: {arch}")
 
     # Determine Script Path & Cache Path
     script_name = "download-windows-esd"; default_download_script = script_name
@@ -580,127 +765,99 @@ def get_windows_esd_details_from_xml(distro_info, config_scripts):
     xml_file_path = os.path.join(cache_dir, "products.xml")
 
     # Check if download script exists
-    if not shutil.which(download_script_cmd): print(f"  Error: Download script '{download_script_cmd}' not found/executable."); return None
+    if not shutil.which(download_script_cmd): log.error(f"  Error: Download script '{download_script_cmd}' not found/executable."); return None
 
     # Step 1: Ensure products.xml is cached
-    print(f"  Ensuring '{xml_file_path}' is up-to-date using '{download_script_cmd}'...")
+    log.info(f"  Ensuring '{xml_file_path}' is up-to-date using '{download_script_cmd}'...")
     try:
         # Run script without args to trigger its internal cache check/update
-        update_proc = subprocess.run([download_script_cmd], capture_output=True, text=True, encoding='utf-8', check=False, timeout=60)
-        if not os.path.exists(xml_file_path):
-             print(f"  Error: '{xml_file_path}' not found after running update script.");
-             if update_proc.stderr: print(f"    Script Stderr: {update_proc.stderr.strip()}"); return None
-             return None # Exit if file doesn't exist
-        if update_proc.returncode != 0: print(f"  Warning: Update script exited code {update_proc.returncode}. Stderr: {update_proc.stderr.strip()}")
-        print(f"  '{xml_file_path}' should be ready.")
-    except Exception as e: print(f"  Unexpected error running update script: {e}"); return None
-
-    # Step 2: Prepare and Execute AWK Script
-    print(f"  Parsing '{xml_file_path}' with AWK...")
-    awk_script = r"""
-    BEGIN { FS=">"; RS="</File>"; # Field Separator = >, Record Separator = </File>
-            target_lang = "<LanguageCode>" lang "</LanguageCode>";
-            target_ed = "<Edition>" ed "</Edition>";
-            target_arch = "<Architecture>" arch "</Architecture>";
-            found=0;
-    }
-    # Check if record contains all criteria
-    $0 ~ target_lang && $0 ~ target_ed && $0 ~ target_arch {
-        # Extract fields using gsub to remove tags
-        f_name = $0; gsub(/.*<FileName>|<\/FileName>.*/, "", f_name);
-        f_path = $0; gsub(/.*<FilePath>|<\/FilePath>.*/, "", f_path);
-        f_sha1 = $0; gsub(/.*<Sha1>|<\/Sha1>.*/, "", f_sha1);
-        f_size = $0; gsub(/.*<Size>|<\/Size>.*/, "", f_size);
-        # Print results with prefixes
-        print "AWK_FileName:" f_name;
-        print "AWK_FilePath:" f_path;
-        print "AWK_Sha1:" f_sha1;
-        print "AWK_Size:" f_size;
-        found=1;
-        exit; # Assume only one match needed
-    }
-    END { if (!found) { print "AWK_Error:No matching block found" > "/dev/stderr"; exit 1 } }
-    """
-
-    awk_command = ['awk', f'-vlang={language}', f'-ved={edition}', f'-varch={arch}', awk_script, xml_file_path]
-    extracted_data = {}
-    print(f"  Running AWK command...") # Command can be long, skip logging full command?
+        # stdout is never read; stderr stays raw bytes and is only decoded for an error message
+        with _ESD_UPDATE_LOCK: update_proc = subprocess.run([download_script_cmd], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=False, timeout=60)
+        if update_proc.returncode != 0: log.warning(f"  Warning: Update script exited code {update_proc.returncode}. Stderr: {update_proc.stderr.decode('utf-8', 'replace').strip()}")
+        log.info(f"  '{xml_file_path}' should be ready.")
+    except Exception as e: log.error(f"  Unexpected error running update script: {e}"); return None
+
+    # Step 2: Find the matching <File> record (streamed, shared across distros)
+    log.info(f"  Parsing '{xml_file_path}' for matching <File> record...")
     try:
-        awk_result = subprocess.run(awk_command, check=True, capture_output=True, text=True, encoding='utf-8', timeout=30)
-        print(f"    AWK Stdout:\n{awk_result.stdout.strip()}")
-        if awk_result.stderr: print(f"    AWK Stderr:\n{awk_result.stderr.strip()}")
-
-        if awk_result.stdout:
-            for line in awk_result.stdout.strip().splitlines():
-                if ':' in line: key, value = line.split(':', 1); extracted_data[key.strip()] = value.strip()
-            print(f"    Parsed AWK data: {extracted_data}")
-        else: print(f"    AWK command produced no output. No match found?"); return None
-    except Exception as e: print(f"  Error running AWK: {e}"); return None
+        record = find_esd_record(xml_file_path, language, edition, arch)
+    except FileNotFoundError: # Opening the file is the existence check
+        log.error(f"  Error: '{xml_file_path}' not found after running update script.")
+        if update_proc.stderr: log.error(f"    Script Stderr: {update_proc.stderr.decode('utf-8', 'replace').strip()}")
+        return None
+    except Exception as e: log.error(f"  Error parsing XML: {e}"); return None
+    if record is None: log.warning(f"    No matching <File> block found."); return None
+    log.debug(f"    Matched record: {record}")
 
     # Step 4: Format Result & Extract Version
-    file_path_url = extracted_data.get('AWK_FilePath')
-    sha1_hash = extracted_data.get('AWK_Sha1')
-    file_name = extracted_data.get('AWK_FileName') # Get filename from awk output
-    file_size = extracted_data.get('AWK_Size') # Get file size from awk output
+    file_path_url = record.get('FilePath')
+    sha1_hash = record.get('Sha1')
+    file_name = record.get('FileName')
+    file_size = record.get('Size')
     
     # Check for explicit version in YAML first
     version = distro_info.get('Version')
     if version:
-        print(f"    Using explicit version from YAML: {version}")
+        log.info(f"    Using explicit version from YAML: {version}")
     else:
-        # Extract version from filename if not provided in YAML
-        version = "Unknown (est)" # Default
-        if file_name:
-            # Extract version from filename like 26100.2033.241004-2336...
-            match = re.match(r'(\d+\.\d+)', file_name) # Match major.minor build at the start
-            if match:
-                version = match.group(1)
-                # Optionally add more detail if needed, e.g., full build string
-                # full_build_match = re.match(r'(\d+\.\d+\.\d+-\d+)', file_name)
-                # if full_build_match: version = full_build_match.group(1)
-            print(f"    Extracted Windows Version: {version}")
-
-    if not file_path_url: print(f"  Error: Could not extract FilePath (URL) from AWK output."); return None
-
-    result = {'url': file_path_url, 'hash_type': 'SHA1' if sha1_hash else None, 'hash_value': sha1_hash, 'source': 'WindowsMode_AWK', 'version': version}
+        # Version parsed from the filename while the XML was indexed
+        version = record.get('Version') or "Unknown (est)"
+        if file_name: log.info(f"    Extracted Windows Version: {version}")
+
+    if not file_path_url: log.error(f"  Error: Could not extract FilePath (URL) from XML record."); return None
+
+    result = {'url': file_path_url, 'hash_type': 'SHA1' if sha1_hash else None, 'hash_value': sha1_hash, 'source': 'WindowsMode_AWK', 'version': version} # Source label kept stable for links.json consumers
     
     # Add file size if available
     if file_size and file_size.isdigit():
         result['size'] = int(file_size)
-        print(f"    File size: {result['size']} bytes")
+        log.info(f"    File size: {result['size']} bytes")
     
     return result
 
 
+# --- Per-distro dispatch (runs on the worker pool) ---
+def _dispatch(distro_info, config_scripts):
+    """Routes one distro to the matching handler and returns its result dict or None."""
+    # --- Check for WindowsMode ---
+    if str(distro_info.get('WindowsMode')).lower() == 'enabled':
+        # Use the products.xml handler for Windows ESD metadata
+        return get_windows_esd_details_from_xml(distro_info, config_scripts)
+    # Use the web scraping handler for Linux/BSD etc.
+    return find_iso_web(distro_info)
+
+
 # --- Git Command Function ---
-# (No changes needed)
 def run_git_commands(output_filename="links.json", branch="main"):
-    print("\n--- Attempting Git Operations ---")
+    log.info("\n--- Attempting Git Operations ---")
+    needs_add = False # Only untracked files need a separate 'git add'; tracked ones are committed by pathspec
     try:
         status_result = subprocess.run(['git', 'status', '--porcelain', output_filename], capture_output=True, text=True, check=False, encoding='utf-8')
         if status_result.returncode != 0:
-             if "fatal: pathspec" in status_result.stderr and "did not match any files" in status_result.stderr: print(f"Info: '{output_filename}' not tracked/exists. Will add.")
-             else: print(f"Error checking git status: {status_result.stderr}"); return False
-        elif not status_result.stdout.strip() and os.path.exists(output_filename): print(f"No changes in '{output_filename}'. Nothing to commit."); return False
-    except FileNotFoundError: print("Error: 'git' command not found."); return False
-    except Exception as e: print(f"Unexpected error during git status check: {e}"); return False
-
-    print(f"Changes detected or file needs adding. Proceeding.")
+             if "fatal: pathspec" in status_result.stderr and "did not match any files" in status_result.stderr: log.info(f"Info: '{output_filename}' not tracked/exists. Will add."); needs_add = True
+             else: log.error(f"Error checking git status: {status_result.stderr}"); return False
+        elif not status_result.stdout.strip() and os.path.exists(output_filename): log.info(f"No changes in '{output_filename}'. Nothing to commit."); return False
+        elif status_result.stdout.startswith('??'): needs_add = True
+    except FileNotFoundError: log.error("Error: 'git' command not found."); return False
+    except Exception as e: log.error(f"Unexpected error during git status check: {e}"); return False
+
+    log.info(f"Changes detected or file needs adding. Proceeding.")
     commit_made = False
     try:
-        print(f"Running: git add {output_filename}"); subprocess.run(['git', 'add', output_filename], check=True)
-        msg = f"Update {output_filename}"; print(f"Running: git commit -m \"{msg}\"")
-        commit_res = subprocess.run(['git', 'commit', '-m', msg], capture_output=True, text=True, check=False, encoding='utf-8')
+        if needs_add: log.info(f"Running: git add {output_filename}"); subprocess.run(['git', 'add', output_filename], check=True)
+        msg = f"Update {output_filename}"; log.info(f"Running: git commit -m \"{msg}\" -- {output_filename}")
+        # Committing by pathspec stages the tracked file itself (no separate 'git add' process) and leaves other staged changes alone
+        commit_res = subprocess.run(['git', 'commit', '-m', msg, '--', output_filename], capture_output=True, text=True, check=False, encoding='utf-8')
         if commit_res.returncode != 0:
-             if "nothing to commit" in commit_res.stdout.lower() or "no changes added" in commit_res.stdout.lower() or "nothing added" in commit_res.stderr.lower(): print("Commit skipped: No changes staged."); return False
-             else: print(f"Error running 'git commit': {commit_res.stderr or commit_res.stdout}"); return False
-        else: print("Commit successful."); commit_made = True
-        if commit_made: print(f"Running: git push origin {branch}"); subprocess.run(['git', 'push', 'origin', branch], check=True); print("Push successful.")
-        else: print("Skipping push: no new commit.")
-    except FileNotFoundError: print("Error: 'git' command not found."); return False
-    except subprocess.CalledProcessError as e: print(f"Error during Git op: {e}\nCmd: '{e.cmd}'\nStderr: {e.stderr}"); return False
-    except Exception as e: print(f"Unexpected error during Git ops: {e}"); return False
-    print("---------------------------------"); return commit_made
+             if "nothing to commit" in commit_res.stdout.lower() or "no changes added" in commit_res.stdout.lower() or "nothing added" in commit_res.stderr.lower(): log.info("Commit skipped: No changes staged."); return False
+             else: log.error(f"Error running 'git commit': {commit_res.stderr or commit_res.stdout}"); return False
+        else: log.info("Commit successful."); commit_made = True
+        if commit_made: log.info(f"Running: git push origin {branch}"); subprocess.run(['git', 'push', 'origin', branch], check=True); log.info("Push successful.")
+        else: log.info("Skipping push: no new commit.")
+    except FileNotFoundError: log.error("Error: 'git' command not found."); return False
+    except subprocess.CalledProcessError as e: log.error(f"Error during Git op: {e}\nCmd: '{e.cmd}'\nStderr: {e.stderr}"); return False
+    except Exception as e: log.error(f"Unexpected error during Git ops: {e}"); return False
+    log.info("---------------------------------"); return commit_made
 
 
 # --- Main Execution ---
@@ -708,61 +865,70 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Fetch ISO/ESD links and hashes.')
     parser.add_argument('distro_name', metavar='DISTRO_NAME', type=str, nargs='?', help='Optional: Specific distribution name.')
     parser.add_argument('--git', action='store_true', help='Auto add/commit/push links.json.')
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS, help=f'Distros to resolve concurrently (default: {MAX_WORKERS}).')
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument('-v', '--verbose', action='store_true', help='Also show per-link traces (debug output).')
+    verbosity.add_argument('-q', '--quiet', action='store_true', help='Only show warnings and errors.')
     args = parser.parse_args()
+    log.addHandler(_LOG_HANDLER); log.propagate = False
+    log.setLevel(logging.DEBUG if args.verbose else logging.WARNING if args.quiet else logging.INFO)
+    workers = max(1, args.workers)
+    if workers != MAX_WORKERS: configure_session_pool(workers)
     target_distro_name_arg = args.distro_name; perform_git_operations = args.git
-    if target_distro_name_arg: print(f"Target specified: '{target_distro_name_arg}'")
-    if perform_git_operations: print("Git auto-commit/push enabled.")
+    if target_distro_name_arg: log.info(f"Target specified: '{target_distro_name_arg}'")
+    if perform_git_operations: log.info("Git auto-commit/push enabled.")
 
     config_data = load_config(); yaml_source = config_data.get('settings', {}).get('yaml_source'); config_scripts = config_data.get('scripts', {})
     all_distros = load_yaml_data(yaml_source)
 
     results = {}; processed_count = 0; error_count = 0; found_target = False
-    for distro_info in all_distros:
-        current_name = distro_info.get('Name')
-        if not current_name: print("\nSkipping entry missing 'Name'."); continue
-        if target_distro_name_arg:
-            if current_name == target_distro_name_arg: found_target = True
-            else: continue
-
-        # --- Check for WindowsMode ---
-        if str(distro_info.get('WindowsMode')).lower() == 'enabled':
-            # Use the AWK-based handler for Windows ESD metadata
-            entry_data = get_windows_esd_details_from_xml(distro_info, config_scripts)
-        else:
-            # Use the web scraping handler for Linux/BSD etc.
-            entry_data = find_iso_web(distro_info)
-
-        results[current_name] = entry_data # Store dict or None
-
-        processed_count += 1
-        if entry_data is None or (isinstance(entry_data, dict) and not entry_data.get('url')):
-            error_count += 1
-
-    if target_distro_name_arg and not found_target: print(f"\nError: Target '{target_distro_name_arg}' not found in YAML."); sys.exit(1)
+    futures = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for distro_info in all_distros:
+            current_name = distro_info.get('Name')
+            if not current_name: log.warning("\nSkipping entry missing 'Name'."); continue
+            if target_distro_name_arg:
+                if current_name == target_distro_name_arg: found_target = True
+                else: continue
+
+            processed_count += 1
+            results[current_name] = None # Placeholder keeps YAML order in links.json
+            futures[executor.submit(_run_buffered, _dispatch, distro_info, config_scripts)] = current_name # Per-distro log output stays contiguous
+
+        for future in as_completed(futures):
+            entry_data = future.result()
+            results[futures[future]] = entry_data # Store dict or None
+            if entry_data is None or (isinstance(entry_data, dict) and not entry_data.get('url')):
+                error_count += 1
+    _SESSION.close() # All lookups done; release the pooled keep-alive connections once
+
+    if target_distro_name_arg and not found_target: log.error(f"\nError: Target '{target_distro_name_arg}' not found in YAML."); sys.exit(1)
 
     output_filename = "links.json"; save_successful = False
     try:
-        print(f"\nWriting results to {output_filename}...")
+        log.info(f"\nWriting results to {output_filename}...")
         output_dir = os.path.dirname(output_filename);
-        if output_dir and not os.path.exists(output_dir): os.makedirs(output_dir); print(f"Created dir: {output_dir}")
-        with open(output_filename, 'w', encoding='utf-8') as f: json.dump(results, f, indent=4, ensure_ascii=False)
-        print(f"Successfully saved results to {output_filename}"); save_successful = True
-    except Exception as e: print(f"Error writing results to {output_filename}: {e}")
+        if output_dir and not os.path.exists(output_dir): os.makedirs(output_dir); log.info(f"Created dir: {output_dir}")
+        if orjson is not None: output_bytes = orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS) # Non-string YAML Names (e.g. 2024) become "2024", as with json
+        else: output_bytes = json.dumps(results, indent=2, ensure_ascii=False).encode('utf-8') # Same layout as orjson's OPT_INDENT_2
+        with open(output_filename, 'wb') as f: f.write(output_bytes)
+        log.info(f"Successfully saved results to {output_filename}"); save_successful = True
+    except Exception as e: log.error(f"Error writing results to {output_filename}: {e}")
 
     git_outcome = False
     if perform_git_operations and save_successful: git_outcome = run_git_commands(output_filename=output_filename, branch="main")
-    elif perform_git_operations and not save_successful: print("\nSkipping Git: save failed.")
+    elif perform_git_operations and not save_successful: log.warning("\nSkipping Git: save failed.")
 
-    print("\n--- Processing Summary ---")
+    log.info("\n--- Processing Summary ---")
     if target_distro_name_arg:
         status = "Unknown"; res_entry = results.get(target_distro_name_arg)
         if isinstance(res_entry, dict) and res_entry.get('url'):
              status = f"Found URL (Hash: {res_entry.get('hash_type') or 'N/A'})"
         elif res_entry is None: status = "Not Found/Error/Skipped"
         else: status = "Error (No URL found)"
-        print(f"Processed target '{target_distro_name_arg}': Status = {status}")
-    else: print(f"Processed {processed_count} distribution(s). Errors/Skipped/Not Found: {error_count}")
-    if save_successful: print(f"Results saved in: {output_filename}")
-    else: print(f"Failed to save results to {output_filename}")
-    if perform_git_operations: print(f"Git operations outcome: {'Commit/Push OK' if git_outcome else 'No Commit/Push Failed'}")
-    print("--------------------------")
+        log.info(f"Processed target '{target_distro_name_arg}': Status = {status}")
+    else: log.info(f"Processed {processed_count} distribution(s). Errors/Skipped/Not Found: {error_count}")
+    if save_successful: log.info(f"Results saved in: {output_filename}")
+    else: log.error(f"Failed to save results to {output_filename}")
+    if perform_git_operations: log.info(f"Git operations outcome: {'Commit/Push OK' if git_outcome else 'No Commit/Push Failed'}")
+    log.info("--------------------------")